@@ -1,101 +1,366 @@
+import numpy as np
 import pandas as pd
-import plotly.express as px
-from dash import Dash, html, dcc, dash_table, Input, Output, State
+import pyarrow as pa
+import pyarrow.parquet as pq
+import plotly.graph_objects as go
+import plotly.io as pio
+from dash import Dash, html, dcc, dash_table, Input, Output, State, DiskcacheManager
 import dash_bootstrap_components as dbc
+import diskcache
 import openai
 import traceback
+import threading
 import logging
 import sys
 import os
+import io
+import gzip
+import textwrap
+from html import escape
+import math
+import functools
+import hashlib
+import pathlib
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
 
 
 # Set up logging
 logging.basicConfig(level=logging.DEBUG, stream=sys.stdout)
 logger = logging.getLogger(__name__)
 
+# Encode figures and callback responses with orjson (Dash serializes through Plotly's JSON engine)
+pio.json.config.default_engine = 'orjson'
+
 # Set up OpenAI API (ensure this is your valid API key)
 openai.api_key = os.getenv("OPENAI_API_KEY")
 
+# System prompt for the AI assistant, built once; the unchanging prefix also lets OpenAI reuse its prompt cache
+SYSTEM_PROMPT = textwrap.dedent("""\
+    You are an AI assistant for the One For The World (OFTW) dashboard. Use the following glossary to answer questions about data fields and metrics:
+    Term,Definition,Source,Notes
+    donor_id,A unique identifier assigned to each donor.,Pledges, Payments,Used to track individual donors across pledges and payments.
+    pledge_id,A unique identifier for each pledge; a new pledge is created if a donor changes amount or frequency.,Pledges, Payments,Key for merging datasets; multiple pledges per donor are possible.
+    donor_chapter,The channel or organization where a donor first signed their pledge (e.g., university chapter).,Pledges,No difference between 'n/a' and empty cells; both indicate unknown.
+    chapter_type,Categories of `donor_chapter` (e.g., UG for Undergraduate).,Pledges,Helps group chapters by type for analysis.
+    pledge_status,Status of the pledge (e.g., Active donor, Pledged donor, Payment failure, Churned donor).,Pledges,Focus on 'Active' or 'Pledged' for key metrics; 'Payment failure' and 'Churned' indicate attrition.
+    pledge_created_at,The date and time when the pledge was created.,Pledges,Used for tracking pledge initiation.
+    pledge_starts_at,The date when the pledge payment schedule begins.,Pledges,Relevant for future pledge analysis.
+    pledge_ended_at,The date when the pledge payment schedule ends (if applicable).,Pledges,Indicates completed or cancelled pledges.
+    contribution_amount,The amount of money the donor pledged to contribute.,Pledges,Basis for Annualized Run Rate (ARR) calculations; may need USD conversion.
+    currency,The currency in which the pledged payments are to be made.,Pledges, Payments,Metrics often require conversion to USD for consistency.
+    frequency,The frequency of pledged payments (e.g., monthly, one-time).,Pledges,Affects ARR and payment scheduling.
+    payment_platform,The platform that processed the payment (e.g., Benevity, Donational).,Pledges, Payments,Useful for analyzing platform performance.
+    id,A unique identifier for each payment record.,Payments,Distinct from `pledge_id`; used for payment tracking.
+    portfolio,The allocation of the donation (e.g., OFTW Top Picks, Entire OFTW Portfolio).,Payments,Excludes 'Discretionary Fund' and 'Operating Costs' for Money Moved calculations.
+    amount,The amount of money donated in a payment.,Payments,Basis for Money Moved; multiplied by `counterfactuality` for impact assessment.
+    date,The date when the payment was made.,Payments,Used for YTD and time lag calculations.
+    counterfactual,A value between 0 and 1 indicating the likelihood that the donation wouldn’t have occurred without OFTW (0 = 0%, 1 = 100%).,Payments,Multiplied by `amount` to calculate counterfactual Money Moved.
+    Money Moved (YTD),Total amount of money moved year-to-date, adjusted by `counterfactuality`, for the fiscal year (July 1 to June 30).,KPIs,Current YTD is July 1, 2024, to March 09, 2025; excludes discretionary/operating costs.
+    Counterfactual MM,Money Moved multiplied by the `counterfactuality` value to reflect OFTW’s unique impact.,KPIs,Key impact metric; excludes certain portfolios.
+    Active Annualized Run Rate (ARR),Total monthly donation amount from active pledges, converted to USD.,KPIs,Based on `contribution_amount` for `Active donor` pledges.
+    Pledge Attrition Rate,Proportion of pledges with status 'Payment failure' or 'Churned donor' relative to all pledges.,KPIs,Indicates donor retention; helps target interventions.
+    Total Number of Active Donors,Count of unique `donor_id` with `pledge_status` 'Active donor' or 'one-time'.,KPIs,Tracks active donor base.
+    Total Number of Active Pledges,Count of unique `pledge_id` with `pledge_status` 'Active donor'.,KPIs,Measures current payment commitments.
+    Chapter ARR,ARR broken down by `donor_chapter` and `chapter_type`.,KPIs,Identifies high-performing chapters.
+    Fiscal Year,The OFTW financial year, running from July 1 to June 30.,KPIs,Current fiscal year is July 1, 2024, to June 30, 2025.
+
+    The dashboard contains the following charts:
+    Chart,Description
+    Active Annualized Run Rate by Top 10 Chapters,A horizontal bar chart displaying the total monthly donation amounts from active pledges (pledge_status 'Active donor') for the top 10 chapters by `contribution_amount`. The x-axis shows the Annualized Run Rate in USD, and the y-axis lists the chapters. It helps identify which chapters are contributing the most to recurring revenue.
+    Pledge Attrition Rate,A pie chart showing the proportion of pledges that have the status 'Payment failure' or 'Churned donor' compared to all pledges. It indicates donor retention challenges by visualizing the percentage of pledges that have failed or been discontinued versus those that remain active.
+    Time Lag Distribution (Days),A histogram illustrating the distribution of the time lag (in days) between the pledge creation date (`pledge_created_at`) and the payment date (`date`). It helps understand delays in donor payments, highlighting how long it typically takes for donors to fulfill their pledges after making them.
+
+    The dashboard also contains the following non-chart elements (do not describe these as charts):
+    Element,Description
+    Total Counterfactual Money Moved (YTD: July 1, 2024 - March 09, 2025),A text metric showing the total amount of money moved year-to-date, adjusted by `counterfactuality`, reflecting OFTW’s unique impact for the fiscal year from July 1, 2024, to March 09, 2025. It excludes donations to 'Discretionary Fund' and 'Operating Costs'. This is not a chart but a summary statistic.
+    Merged Data Sample,A table displaying the merged dataset, combining pledges and payments data on `pledge_id`. It includes columns like `donor_id`, `pledge_status`, `amount`, etc. This is not a chart but a data table for reference.
+
+    When asked to explain charts, use simple language as if explaining to a novice. For example, if asked 'explain each chart in this tool like I'm a novice,' list all three charts and describe them in easy terms. For other inquiries, provide clear and concise explanations about fields, metrics, or charts as requested.
+""").strip()
+SYSTEM_MESSAGE = {"role": "system", "content": SYSTEM_PROMPT}
+
 
 try:
     # Load and merge data
     logger.debug("Loading data...")
     pledges_url = "https://storage.googleapis.com/plotly-app-challenge/one-for-the-world-pledges.json"
     payments_url = "https://storage.googleapis.com/plotly-app-challenge/one-for-the-world-payments.json"
-    pledges_df = pd.read_json(pledges_url)
-    payments_df = pd.read_json(payments_url)
-    merged_df = pd.merge(pledges_df, payments_df, on='pledge_id', how='outer')
 
-    # Preprocess
-    merged_df['pledge_created_at'] = pd.to_datetime(merged_df['pledge_created_at'])
-    merged_df['date'] = pd.to_datetime(merged_df['date'])
-    merged_df = merged_df[~merged_df['portfolio'].isin(['One for the World Discretionary Fund',
-                                                        'One for the World Operating Costs'])]
-    merged_df['counterfactual_mm'] = merged_df['amount'] * merged_df['counterfactuality'].fillna(0)
+    # Preprocessed data is cached locally as Parquet, tagged with a hash of the sources' Last-Modified headers
+    # and of the preprocessing itself. Bump DATA_CACHE_VERSION whenever build_merged_data or table_columns change.
+    data_cache_path = pathlib.Path(__file__).with_name('merged_data.parquet')
+    DATA_CACHE_VERSION = '5'
+
+    # None means the sources could not be reached; '' means they were reached but report no
+    # Last-Modified date, so there is nothing to validate a cache against
+    def fetch_source_version():
+        try:
+            version_parts = [DATA_CACHE_VERSION]
+            for url in (pledges_url, payments_url):
+                request = urllib.request.Request(url, method='HEAD')
+                # A short timeout keeps an unresponsive network from holding up the cached start
+                with urllib.request.urlopen(request, timeout=2) as response:
+                    last_modified = response.headers.get('Last-Modified')
+                if not last_modified:
+                    return ''
+                version_parts.append(last_modified)
+            return hashlib.sha256('\n'.join(version_parts).encode()).hexdigest()
+        except OSError:
+            logger.warning(f"Could not check source data versions: {traceback.format_exc()}")
+            return None
+
+    def read_cached_data(source_version):
+        if not data_cache_path.exists():
+            return None
+        try:
+            metadata = pq.read_schema(data_cache_path).metadata or {}
+            cached_version = metadata.get(b'source_version', b'').decode()
+            cached_pipeline_version = metadata.get(b'data_cache_version', b'').decode()
+            # Offline, a cache from the current pipeline beats failing to start; online, the sources must match
+            if cached_pipeline_version != DATA_CACHE_VERSION or (
+                    source_version is not None and (not source_version or cached_version != source_version)):
+                logger.debug("Cached data is stale")
+                return None
+            # Let Arrow free each column as it is converted, so startup never holds the Arrow table
+            # and the DataFrame in full at the same time
+            table = pq.read_table(data_cache_path)
+            return table.to_pandas(split_blocks=True, self_destruct=True)
+        except (OSError, pa.ArrowException):
+            logger.warning(f"Could not read data cache: {traceback.format_exc()}")
+            return None
+
+    def write_cached_data(df, source_version):
+        try:
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            metadata = {**(table.schema.metadata or {}), b'source_version': (source_version or '').encode(),
+                        b'data_cache_version': DATA_CACHE_VERSION.encode()}
+            pq.write_table(table.replace_schema_metadata(metadata), data_cache_path, compression='zstd')
+        except (OSError, pa.ArrowException):
+            logger.warning(f"Could not write data cache: {traceback.format_exc()}")
+
+    # Columns used by the KPIs, charts and table ('id' is the fallback donor key)
+    table_columns = ['pledge_id', 'donor_id', 'id', 'donor_chapter', 'chapter_type', 'pledge_status',
+                     'pledge_created_at', 'contribution_amount', 'currency', 'frequency', 'portfolio',
+                     'amount', 'currency_payment', 'date', 'counterfactuality', 'counterfactual_mm']
+
+    def build_merged_data():
+        # Download and parse both files concurrently (network I/O releases the GIL)
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            pledges_future = executor.submit(pd.read_json, pledges_url)
+            payments_future = executor.submit(pd.read_json, payments_url)
+            pledges_df = pledges_future.result()
+            payments_df = payments_future.result()
+        # Project both sources to the used columns before joining so the merge only moves needed data
+        pledges_df = pledges_df[[column for column in pledges_df.columns if column in table_columns]]
+        payments_df = payments_df[[column for column in payments_df.columns if column in table_columns]]
+        # donor_id and currency are in both sources; the payment's copies get a '_payment' suffix
+        merged_df = pd.merge(pledges_df, payments_df, on='pledge_id', how='outer', suffixes=('', '_payment'))
+        # Payments without a matching pledge still know their donor
+        if 'donor_id_payment' in merged_df.columns:
+            merged_df['donor_id'] = merged_df['donor_id'].fillna(merged_df['donor_id_payment'])
+
+        # Low-cardinality string columns are stored as categories so filters and groupbys compare int codes
+        category_columns = ['pledge_status', 'portfolio', 'donor_chapter', 'currency',
+                            'currency_payment', 'chapter_type', 'frequency']
+        for column in category_columns:
+            if column in merged_df.columns:
+                merged_df[column] = merged_df[column].astype('category')
+
+        # Preprocess
+        merged_df['pledge_created_at'] = pd.to_datetime(merged_df['pledge_created_at'])
+        merged_df['date'] = pd.to_datetime(merged_df['date'])
+        # Counterfactual money moved, computed in a single float buffer (fill NaN with 0, then multiply in place)
+        counterfactual_mm = merged_df['counterfactuality'].to_numpy(dtype='float64', na_value=np.nan, copy=True)
+        counterfactual_mm[np.isnan(counterfactual_mm)] = 0.0
+        np.multiply(merged_df['amount'].to_numpy(dtype='float64', na_value=np.nan), counterfactual_mm, out=counterfactual_mm)
+        merged_df['counterfactual_mm'] = counterfactual_mm
+
+        # Exclude the non-program portfolios and keep only the used columns, in table order, in a single copy
+        kept_rows = ~merged_df['portfolio'].isin(['One for the World Discretionary Fund',
+                                                  'One for the World Operating Costs'])
+        merged_df = merged_df.loc[kept_rows, [column for column in table_columns if column in merged_df.columns]]
+
+        # Drop categories that only occurred in the excluded portfolio rows
+        for column in merged_df.select_dtypes('category').columns:
+            merged_df[column] = merged_df[column].cat.remove_unused_categories()
+
+        return merged_df
+
+    source_version = fetch_source_version()
+    merged_df = read_cached_data(source_version)
+    if merged_df is None:
+        merged_df = build_merged_data()
+        write_cached_data(merged_df, source_version)
+    else:
+        logger.debug(f"Loaded cached data from {data_cache_path}")
 
     # YTD range for fiscal year (July 1, 2024 - March 09, 2025)
     ytd_start = pd.Timestamp('2024-07-01')
     ytd_end = pd.Timestamp('2025-03-09')
-    ytd_df = merged_df[(merged_df['date'] >= ytd_start) & (merged_df['date'] <= ytd_end)]
-    total_mm_ytd = ytd_df['counterfactual_mm'].sum()
+    total_mm_ytd = merged_df.loc[merged_df['date'].between(ytd_start, ytd_end), 'counterfactual_mm'].sum()
+
+    # Pledges per status, counted in one pass and shared by the KPIs below
+    status_counts = merged_df['pledge_status'].value_counts()
 
     # Attrition
-    attrition_pledges = merged_df[merged_df['pledge_status'].isin(['Payment failure', 'Churned donor'])]
+    attrition_count = sum(status_counts.get(status, 0) for status in ['Payment failure', 'Churned donor'])
     total_pledges = len(merged_df)
-    attrition_rate = (len(attrition_pledges) / total_pledges * 100) if total_pledges > 0 else 0
+    attrition_rate = (attrition_count / total_pledges * 100) if total_pledges > 0 else 0
 
-    # Active donors
+    # Active donors: distinct donor codes over the union of statuses, so donors with both are counted once
     if 'donor_id' in merged_df.columns:
-        active_donors = merged_df[merged_df['pledge_status'].isin(['Active donor', 'one-time'])]['donor_id'].nunique()
+        donor_column = 'donor_id'
     elif 'id' in merged_df.columns:
-        active_donors = merged_df[merged_df['pledge_status'].isin(['Active donor', 'one-time'])]['id'].nunique()
+        donor_column = 'id'
+    else:
+        donor_column = None
+    if donor_column is not None:
+        active_mask = merged_df['pledge_status'].isin(['Active donor', 'one-time']).to_numpy()
+        donor_codes = merged_df[donor_column].astype('category').cat.codes.to_numpy()[active_mask]
+        active_donors = np.unique(donor_codes[donor_codes >= 0]).size  # code -1 is a missing id
     else:
         active_donors = 0
 
     # ARR by chapter (top 10)
     arr_data = (
-        merged_df[merged_df['pledge_status'] == 'Active donor']
-        .groupby('donor_chapter')['contribution_amount']
+        merged_df.loc[merged_df['pledge_status'].eq('Active donor'), ['donor_chapter', 'contribution_amount']]
+        .groupby('donor_chapter', observed=True, sort=False)['contribution_amount']
         .sum()
+        .nlargest(10)
         .reset_index()
     )
-    arr_data = arr_data.nlargest(10, 'contribution_amount')
 
-    # Initialize Dash app
-    app = Dash(__name__, external_stylesheets=[dbc.themes.BOOTSTRAP])
+    # Time lag between pledge creation and payment, computed and binned once
+    time_lag_days = (merged_df['date'] - merged_df['pledge_created_at']).dt.days.dropna().to_numpy()
+    time_lag_counts, time_lag_edges = np.histogram(time_lag_days, bins=30)
+
+    # Plain arrays for the chart traces, extracted once
+    arr_x = arr_data['contribution_amount'].to_numpy()
+    arr_y = arr_data['donor_chapter'].to_numpy()
+    attrition_values = [total_pledges - attrition_count, attrition_count]
+
+    # Plotly chart themes, registered once and layered on the default 'plotly' template;
+    # page colors live in assets/theme.css
+    chart_themes = {
+        'oftw_light': {'paper_color': '#FFFFFF', 'text_color': '#2C3E50',
+                       'bar_color': '#1f77b4', 'pie_colors': ['#4682B4', '#FF6F61']},
+        'oftw_dark': {'paper_color': '#2E2E2E', 'text_color': '#CCCCCC',
+                      'bar_color': '#3399FF', 'pie_colors': ['#3399FF', '#FF6F61']},
+    }
+    for template_name, theme in chart_themes.items():
+        pio.templates[template_name] = go.layout.Template(
+            layout=go.Layout(
+                plot_bgcolor='rgba(0,0,0,0)',
+                paper_bgcolor=theme['paper_color'],
+                font_color=theme['text_color'],
+                colorway=[theme['bar_color']],
+                piecolorway=theme['pie_colors'],
+                xaxis={'gridcolor': 'rgba(255,255,255,0.1)'},
+                yaxis={'gridcolor': 'rgba(255,255,255,0.1)'}
+            )
+        )
+
+    # Chart template for light (False) and dark (True) mode
+    THEME_TEMPLATES = {False: 'plotly+oftw_light', True: 'plotly+oftw_dark'}
+
+    def build_figures(dark_mode):
+        template = THEME_TEMPLATES[dark_mode]
+
+        arr_fig = go.Figure(
+            go.Bar(
+                x=arr_x,
+                y=arr_y,
+                orientation='h',
+                hovertemplate='Annualized Run Rate (USD)=%{x}<br>Chapter=%{y}<extra></extra>'
+            )
+        ).update_layout(
+            template=template,
+            title='Active Annualized Run Rate by Top 10 Chapters',
+            height=600,
+            xaxis={'title': 'Annualized Run Rate (USD)'},
+            yaxis={'title': 'Chapter', 'tickangle': 0, 'automargin': True},
+            margin=dict(l=200, r=50, t=50, b=50)
+        )
+
+        attrition_fig = go.Figure(
+            go.Pie(
+                values=attrition_values,
+                labels=['Active', 'Attrition'],
+                sort=False
+            )
+        ).update_layout(
+            template=template,
+            title='Pledge Attrition Rate'
+        )
+
+        time_lag_fig = go.Figure(
+            go.Bar(
+                x=time_lag_edges[:-1],
+                y=time_lag_counts,
+                width=np.diff(time_lag_edges),
+                offset=0
+            )
+        ).update_layout(
+            template=template,
+            title='Time Lag Distribution (Days)',
+            bargap=0,
+            xaxis={'title': 'Days'},
+            yaxis={'title': 'count'}
+        )
+
+        return {'arr': arr_fig, 'attrition': attrition_fig, 'time_lag': time_lag_fig}
+
+    # Precompute figures for both themes once at startup
+    FIGURES = {dark_mode: build_figures(dark_mode) for dark_mode in (False, True)}
+
+    # Disk caches live next to the script, whatever directory the app is started from
+    cache_dir = pathlib.Path(__file__).parent / 'cache'
 
-    # Define chart components
-    arr_chart = dcc.Graph(id='arr-chart')
-    attrition_chart = dcc.Graph(id='attrition-chart')
-    time_lag_chart = dcc.Graph(id='time-lag-chart')
+    # Initialize Dash app (background callbacks run in worker processes coordinated through a disk cache)
+    background_callback_manager = DiskcacheManager(diskcache.Cache(str(cache_dir / 'background')))
+    app = Dash(__name__, external_stylesheets=[dbc.themes.BOOTSTRAP],
+               background_callback_manager=background_callback_manager)
 
-    # DataTable
+    # Define chart components (rendered with the light theme up front, so no callback runs on page load)
+    arr_chart = dcc.Graph(id='arr-chart', figure=FIGURES[False]['arr'])
+    attrition_chart = dcc.Graph(id='attrition-chart', figure=FIGURES[False]['attrition'])
+    time_lag_chart = dcc.Graph(id='time-lag-chart', figure=FIGURES[False]['time_lag'])
+
+    # DataTable (paged, filtered and sorted server-side; only the visible page is sent to the browser).
+    # The unfiltered first page is rendered into the layout, so no callback runs on page load.
+    table_page_size = 10
     data_table = dash_table.DataTable(
         id='merged-data-table',
         columns=[{'name': i, 'id': i} for i in merged_df.columns],
-        data=merged_df.to_dict('records'),
-        page_action='native',
-        page_size=10,
-        sort_action='native',
-        filter_action='native',
+        data=merged_df.iloc[:table_page_size].to_dict('records'),
+        page_action='custom',
+        page_current=0,
+        page_size=table_page_size,
+        page_count=max(1, math.ceil(len(merged_df) / table_page_size)),
+        sort_action='custom',
+        sort_mode='single',
+        sort_by=[],
+        filter_action='custom',
+        filter_query='',
         style_table={'overflowX': 'auto'},
         style_cell={'textAlign': 'left', 'padding': '5px'},
-        style_header={'backgroundColor': 'rgb(230, 230, 230)', 'fontWeight': 'bold', 'color': '#2C3E50'},
-        style_data={'backgroundColor': 'rgb(255, 255, 255)', 'color': '#2C3E50'}
+        style_header={'backgroundColor': 'var(--table-header-bg)', 'fontWeight': 'bold', 'color': 'var(--table-text-color)'},
+        style_data={'backgroundColor': 'var(--table-data-bg)', 'color': 'var(--table-text-color)'}
     )
 
-    # Dropdown filters
+    # Dropdown filters (read from the category metadata, no scan over the rows)
     donor_chapters = [{'label': 'All Chapters', 'value': 'All'}] + [
         {'label': chapter, 'value': chapter}
-        for chapter in merged_df['donor_chapter'].dropna().unique()
+        for chapter in merged_df['donor_chapter'].cat.categories
     ]
     pledge_statuses = [{'label': 'All Statuses', 'value': 'All'}] + [
         {'label': status, 'value': status}
-        for status in merged_df['pledge_status'].dropna().unique()
+        for status in merged_df['pledge_status'].cat.categories
     ]
 
     # Full glossary content
-    glossary_data = [
+    glossary_data = (
         ("donor_id", "A unique identifier assigned to each donor.", "Pledges, Payments", "Used to track individual donors across pledges and payments."),
         ("pledge_id", "A unique identifier for each pledge; a new pledge is created if a donor changes amount or frequency.", "Pledges, Payments", "Key for merging datasets; multiple pledges per donor are possible."),
         ("donor_chapter", "The channel or organization where a donor first signed their pledge (e.g., university chapter).", "Pledges", "No difference between 'n/a' and empty cells; both indicate unknown."),
@@ -121,87 +386,55 @@ try:
         ("Total Number of Active Pledges", "Count of unique `pledge_id` with `pledge_status` 'Active donor'.", "KPIs", "Measures current payment commitments."),
         ("Chapter ARR", "ARR broken down by `donor_chapter` and `chapter_type`.", "KPIs", "Identifies high-performing chapters."),
         ("Fiscal Year", "The OFTW financial year, running from July 1 to June 30.", "KPIs", "Current fiscal year is July 1, 2024, to June 30, 2025.")
-    ]
+    )
 
-    # Glossary table with full rows
-    glossary = html.Table(
-        [html.Tr([html.Th(col, style={'padding': '5px'}) for col in ['Term', 'Definition', 'Source', 'Notes']])] +
-        [
-            html.Tr([
-                html.Td(term, style={'padding': '5px'}),
-                html.Td(definition, style={'padding': '5px'}),
-                html.Td(source, style={'padding': '5px'}),
-                html.Td(notes, style={'padding': '5px'})
-            ])
-            for term, definition, source, notes in glossary_data
-        ],
-        style={
-            'width': '100%',
-            'border': '1px solid #ddd',
-            'margin': '20px 0',
-            'border-collapse': 'collapse'
-        },
-        id='glossary-table'
+    # Glossary table, pre-rendered once to static HTML (a single component instead of one per cell)
+    glossary_html = (
+        '<table>'
+        + '<tr>' + ''.join(f'<th>{escape(col)}</th>' for col in ['Term', 'Definition', 'Source', 'Notes']) + '</tr>'
+        + ''.join(
+            '<tr>' + ''.join(f'<td>{escape(cell)}</td>' for cell in row) + '</tr>'
+            for row in glossary_data
+        )
+        + '</table>'
     )
+    glossary = dcc.Markdown(glossary_html, dangerously_allow_html=True, id='glossary-table')
 
-    # AI query function with OpenAI integration
-    def get_ai_response(query):
+    # AI answers cached on disk per normalized query for an hour, shared by every worker process
+    ai_response_cache = diskcache.Cache(str(cache_dir / 'ai-responses'))
+    ai_response_ttl = 3600
+
+    # AI query function with OpenAI integration; partial answers are passed to on_update as they stream in
+    def get_ai_response(query, on_update=None):
         logger.debug(f"AI query received: {query}")
+        # Collapse whitespace and case so repeated questions are answered from the cache
+        normalized_query = ' '.join(query.lower().split())
+        cache_key = hashlib.sha256(normalized_query.encode()).hexdigest()
+        cached_response = ai_response_cache.get(cache_key)
+        if cached_response is not None:
+            logger.debug("AI response served from cache")
+            return cached_response
         try:
-            response = openai.chat.completions.create(
+            stream = openai.chat.completions.create(
                 model="gpt-3.5-turbo",
                 messages=[
-                    {
-                        "role": "system",
-                        "content": """
-                        You are an AI assistant for the One For The World (OFTW) dashboard. Use the following glossary to answer questions about data fields and metrics:
-                        Term,Definition,Source,Notes
-                        donor_id,A unique identifier assigned to each donor.,Pledges, Payments,Used to track individual donors across pledges and payments.
-                        pledge_id,A unique identifier for each pledge; a new pledge is created if a donor changes amount or frequency.,Pledges, Payments,Key for merging datasets; multiple pledges per donor are possible.
-                        donor_chapter,The channel or organization where a donor first signed their pledge (e.g., university chapter).,Pledges,No difference between 'n/a' and empty cells; both indicate unknown.
-                        chapter_type,Categories of `donor_chapter` (e.g., UG for Undergraduate).,Pledges,Helps group chapters by type for analysis.
-                        pledge_status,Status of the pledge (e.g., Active donor, Pledged donor, Payment failure, Churned donor).,Pledges,Focus on 'Active' or 'Pledged' for key metrics; 'Payment failure' and 'Churned' indicate attrition.
-                        pledge_created_at,The date and time when the pledge was created.,Pledges,Used for tracking pledge initiation.
-                        pledge_starts_at,The date when the pledge payment schedule begins.,Pledges,Relevant for future pledge analysis.
-                        pledge_ended_at,The date when the pledge payment schedule ends (if applicable).,Pledges,Indicates completed or cancelled pledges.
-                        contribution_amount,The amount of money the donor pledged to contribute.,Pledges,Basis for Annualized Run Rate (ARR) calculations; may need USD conversion.
-                        currency,The currency in which the pledged payments are to be made.,Pledges, Payments,Metrics often require conversion to USD for consistency.
-                        frequency,The frequency of pledged payments (e.g., monthly, one-time).,Pledges,Affects ARR and payment scheduling.
-                        payment_platform,The platform that processed the payment (e.g., Benevity, Donational).,Pledges, Payments,Useful for analyzing platform performance.
-                        id,A unique identifier for each payment record.,Payments,Distinct from `pledge_id`; used for payment tracking.
-                        portfolio,The allocation of the donation (e.g., OFTW Top Picks, Entire OFTW Portfolio).,Payments,Excludes 'Discretionary Fund' and 'Operating Costs' for Money Moved calculations.
-                        amount,The amount of money donated in a payment.,Payments,Basis for Money Moved; multiplied by `counterfactuality` for impact assessment.
-                        date,The date when the payment was made.,Payments,Used for YTD and time lag calculations.
-                        counterfactual,A value between 0 and 1 indicating the likelihood that the donation wouldn’t have occurred without OFTW (0 = 0%, 1 = 100%).,Payments,Multiplied by `amount` to calculate counterfactual Money Moved.
-                        Money Moved (YTD),Total amount of money moved year-to-date, adjusted by `counterfactuality`, for the fiscal year (July 1 to June 30).,KPIs,Current YTD is July 1, 2024, to March 09, 2025; excludes discretionary/operating costs.
-                        Counterfactual MM,Money Moved multiplied by the `counterfactuality` value to reflect OFTW’s unique impact.,KPIs,Key impact metric; excludes certain portfolios.
-                        Active Annualized Run Rate (ARR),Total monthly donation amount from active pledges, converted to USD.,KPIs,Based on `contribution_amount` for `Active donor` pledges.
-                        Pledge Attrition Rate,Proportion of pledges with status 'Payment failure' or 'Churned donor' relative to all pledges.,KPIs,Indicates donor retention; helps target interventions.
-                        Total Number of Active Donors,Count of unique `donor_id` with `pledge_status` 'Active donor' or 'one-time'.,KPIs,Tracks active donor base.
-                        Total Number of Active Pledges,Count of unique `pledge_id` with `pledge_status` 'Active donor'.,KPIs,Measures current payment commitments.
-                        Chapter ARR,ARR broken down by `donor_chapter` and `chapter_type`.,KPIs,Identifies high-performing chapters.
-                        Fiscal Year,The OFTW financial year, running from July 1 to June 30.,KPIs,Current fiscal year is July 1, 2024, to June 30, 2025.
-
-                        The dashboard contains the following charts:
-                        Chart,Description
-                        Active Annualized Run Rate by Top 10 Chapters,A horizontal bar chart displaying the total monthly donation amounts from active pledges (pledge_status 'Active donor') for the top 10 chapters by `contribution_amount`. The x-axis shows the Annualized Run Rate in USD, and the y-axis lists the chapters. It helps identify which chapters are contributing the most to recurring revenue.
-                        Pledge Attrition Rate,A pie chart showing the proportion of pledges that have the status 'Payment failure' or 'Churned donor' compared to all pledges. It indicates donor retention challenges by visualizing the percentage of pledges that have failed or been discontinued versus those that remain active.
-                        Time Lag Distribution (Days),A histogram illustrating the distribution of the time lag (in days) between the pledge creation date (`pledge_created_at`) and the payment date (`date`). It helps understand delays in donor payments, highlighting how long it typically takes for donors to fulfill their pledges after making them.
-
-                        The dashboard also contains the following non-chart elements (do not describe these as charts):
-                        Element,Description
-                        Total Counterfactual Money Moved (YTD: July 1, 2024 - March 09, 2025),A text metric showing the total amount of money moved year-to-date, adjusted by `counterfactuality`, reflecting OFTW’s unique impact for the fiscal year from July 1, 2024, to March 09, 2025. It excludes donations to 'Discretionary Fund' and 'Operating Costs'. This is not a chart but a summary statistic.
-                        Merged Data Sample,A table displaying the merged dataset, combining pledges and payments data on `pledge_id`. It includes columns like `donor_id`, `pledge_status`, `amount`, etc. This is not a chart but a data table for reference.
-
-                        When asked to explain charts, use simple language as if explaining to a novice. For example, if asked 'explain each chart in this tool like I'm a novice,' list all three charts and describe them in easy terms. For other inquiries, provide clear and concise explanations about fields, metrics, or charts as requested.
-                        """
-                    },
-                    {"role": "user", "content": query}
+                    SYSTEM_MESSAGE,
+                    {"role": "user", "content": query.strip()}
                 ],
-                max_tokens=500  # Increased to allow more detailed responses
+                max_tokens=500,  # Increased to allow more detailed responses
+                stream=True
             )
+            parts = []
+            for chunk in stream:
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if delta:
+                    parts.append(delta)
+                    if on_update is not None:
+                        on_update(''.join(parts))
+            response = ''.join(parts).strip()
             logger.debug("AI response generated successfully")
-            return response.choices[0].message.content.strip()
+            ai_response_cache.set(cache_key, response, expire=ai_response_ttl)
+            return response
         except Exception as e:
             logger.error(f"Error in get_ai_response: {traceback.format_exc()}")
             return f"Error: Unable to process your request. Please try again later. Details: {str(e)}"
@@ -227,26 +460,29 @@ try:
                 label='Dashboard',
                 style={'padding': '0'},
                 children=[
-                    html.H1("OFTW Dashboard", id='dashboard-title', style={'margin': '0'}),
+                    html.H1("OFTW Dashboard", id='dashboard-title', style={'textAlign': 'center', 'color': 'var(--text-color)'}),
                     html.H3("Key Metrics", style={'textAlign': 'center', 'margin': '10px 0'}),
                     dbc.Row([
                         dbc.Col([
                             html.H4("Total Counterfactual Money Moved (YTD: July 1, 2024 - March 09, 2025)",
-                                    id='money-moved-title'),
+                                    id='money-moved-title',
+                                    style={'textAlign': 'center', 'color': 'var(--text-color)'}),
                             html.P(f"${total_mm_ytd:,.2f}",
-                                   style={'textAlign': 'center', 'fontSize': 24},
+                                   style={'textAlign': 'center', 'fontSize': 24, 'color': 'var(--text-color)'},
                                    id='money-moved-value')
                         ], width=4),
                         dbc.Col([
-                            html.H4("Total Active Donors", id='active-donors-title'),
+                            html.H4("Total Active Donors", id='active-donors-title',
+                                    style={'textAlign': 'center', 'color': 'var(--text-color)'}),
                             html.P(f"{active_donors:,}",
-                                   style={'textAlign': 'center', 'fontSize': 24},
+                                   style={'textAlign': 'center', 'fontSize': 24, 'color': 'var(--text-color)'},
                                    id='active-donors-value')
                         ], width=4),
                         dbc.Col([
-                            html.H4("Pledge Attrition Rate", id='attrition-rate-title'),
+                            html.H4("Pledge Attrition Rate", id='attrition-rate-title',
+                                    style={'textAlign': 'center', 'color': 'var(--text-color)'}),
                             html.P(f"{attrition_rate:.2f}%",
-                                   style={'textAlign': 'center', 'fontSize': 24},
+                                   style={'textAlign': 'center', 'fontSize': 24, 'color': 'var(--text-color)'},
                                    id='attrition-rate-value')
                         ], width=4),
                     ], style={'margin-bottom': '20px'}),
@@ -261,11 +497,11 @@ try:
                     ], type='default'),
 
                     # Table
-                    html.H3("Merged Data Sample", id='table-title'),
+                    html.H3("Merged Data Sample", id='table-title', style={'color': 'var(--text-color)'}),
                     dbc.Row([
                         dbc.Col([
                             # Give the label an ID
-                            html.Label("Filter by Donor Chapter:", id='chapter-filter-label'),
+                            html.Label("Filter by Donor Chapter:", id='chapter-filter-label', style={'color': 'var(--text-color)'}),
                             dcc.Dropdown(
                                 id='chapter-filter',
                                 options=donor_chapters,
@@ -275,7 +511,7 @@ try:
                         ], width=3),
                         dbc.Col([
                             # Give the label an ID
-                            html.Label("Filter by Pledge Status:", id='status-filter-label'),
+                            html.Label("Filter by Pledge Status:", id='status-filter-label', style={'color': 'var(--text-color)'}),
                             dcc.Dropdown(
                                 id='status-filter',
                                 options=pledge_statuses,
@@ -286,7 +522,7 @@ try:
                     ], style={'margin-bottom': '10px'}),
                     dbc.Row([
                         dbc.Col(dcc.Download(id="download-data-csv"), width=2),
-                        dbc.Col(html.Button("Export to CSV", id="btn-csv", n_clicks=0), width=2)
+                        dbc.Col(html.Button("Export to CSV (.csv.gz)", id="btn-csv", n_clicks=0), width=2)
                     ]),
                     dcc.Loading(id='loading-table', children=[data_table], type='default')
                 ]
@@ -297,14 +533,15 @@ try:
                 children=[
                     html.H2("OFTW Data Glossary",
                             id='glossary-title',
-                            style={'textAlign': 'center', 'margin': '10px 0'}),
+                            style={'textAlign': 'center', 'margin': '10px 0', 'color': 'var(--text-color)'}),
                     html.P("This glossary defines key terms and metrics used in the OFTW dashboard.",
                            id='glossary-description',
-                           style={'textAlign': 'center', 'margin': '0'}),
+                           style={'textAlign': 'center', 'margin': '0', 'color': 'var(--text-color)'}),
                     html.Div(
                         glossary,
                         id='glossary-table-container',
-                        style={'padding': '0', 'margin': '0'}
+                        style={'backgroundColor': 'var(--panel-bg)', 'padding': '0', 'margin': '0',
+                               'color': 'var(--text-color)'}
                     )
                 ]
             ),
@@ -314,197 +551,226 @@ try:
                 children=[
                     html.H2("OFTW AI Assistant",
                             id='ai-title',
-                            style={'textAlign': 'center', 'margin': '10px 0'}),
+                            style={'textAlign': 'center', 'margin': '10px 0', 'color': 'var(--text-color)'}),
                     html.P("Ask questions about data fields, metrics, or charts. For example, 'Explain the Time Lag Distribution chart'.",
                            id='ai-description',
-                           style={'textAlign': 'center', 'margin': '0'}),
+                           style={'textAlign': 'center', 'margin': '0', 'color': 'var(--text-color)'}),
                     dcc.Input(
                         id='ai-query-input',
                         type='text',
                         placeholder='Enter your question...',
-                        style={'width': '80%', 'margin': '10px'}
+                        style={'width': '80%', 'margin': '10px', 'color': 'var(--input-text)',
+                               'backgroundColor': 'var(--input-bg)'}
                     ),
                     html.Button('Submit', id='ai-submit-button', n_clicks=0, style={'margin': '10px'}),
                     html.Div(
+                        "Please enter a question and click Submit",
                         id='ai-response',
-                        style={'margin': '10px', 'whiteSpace': 'pre-wrap', 'minHeight': '100px'}
+                        style={'margin': '10px', 'whiteSpace': 'pre-wrap', 'color': 'var(--text-color)',
+                               'backgroundColor': 'var(--panel-bg)', 'minHeight': '100px'}
                     )
                 ]
             )
         ])
     ],
     id='main-container',
-    style={'minHeight': '100vh', 'margin': 0, 'padding': 0, 'backgroundColor': '#ECF0F1'}
+    className='theme-light',
+    style={'minHeight': '100vh', 'margin': 0, 'padding': 0, 'backgroundColor': 'var(--background-color)'}
     )
 
-    # Dark mode callback
+    # Dark mode: the page restyles in the browser by swapping the theme class (CSS variables in assets/theme.css)
+    app.clientside_callback(
+        "function(dark) { return dark ? 'theme-dark' : 'theme-light'; }",
+        Output('main-container', 'className'),
+        Input('dark-mode-switch', 'value')
+    )
+
+    # Dark mode figures: only the three charts round-trip to the server, as a lookup of precomputed figures
     @app.callback(
-        # 24 outputs total (22 old + 2 for label styles)
-        Output('main-container', 'style'),
-        Output('dashboard-title', 'style'),
-        Output('money-moved-title', 'style'),
-        Output('money-moved-value', 'style'),
-        Output('active-donors-title', 'style'),
-        Output('active-donors-value', 'style'),
-        Output('attrition-rate-title', 'style'),
-        Output('attrition-rate-value', 'style'),
-        Output('table-title', 'style'),
         Output('arr-chart', 'figure'),
         Output('attrition-chart', 'figure'),
         Output('time-lag-chart', 'figure'),
-        Output('merged-data-table', 'style_header'),
-        Output('merged-data-table', 'style_data'),
-        Output('ai-query-input', 'style'),
-        Output('ai-response', 'style'),
-        Output('glossary-table-container', 'style'),
-        Output('glossary-table', 'style'),
-        Output('glossary-title', 'style'),
-        Output('glossary-description', 'style'),
-        Output('ai-title', 'style'),
-        Output('ai-description', 'style'),
-        Output('chapter-filter-label', 'style'),
-        Output('status-filter-label', 'style'),
-        Input('dark-mode-switch', 'value')
+        Input('dark-mode-switch', 'value'),
+        prevent_initial_call=True
     )
     def update_dark_mode(dark_mode):
-        if dark_mode:
-            background_color  = '#1E1E1E'
-            text_color        = '#CCCCCC'
-            chart_paper_color = '#2E2E2E'
-            chart_text_color  = '#CCCCCC'
-            table_header_bg   = '#333333'
-            table_data_bg     = '#2E2E2E'
-            table_text_color  = '#CCCCCC'
-            input_bg          = '#2E2E2E'
-            input_text        = '#FFFFFF'
-            bar_color         = '#3399FF'
-            table_container_bg= '#2E2E2E'
-            response_bg       = '#2E2E2E'
-            table_bg          = '#2E2E2E'
-        else:
-            background_color  = '#ECF0F1'
-            text_color        = '#2C3E50'
-            chart_paper_color = '#FFFFFF'
-            chart_text_color  = '#2C3E50'
-            table_header_bg   = 'rgb(230, 230, 230)'
-            table_data_bg     = 'rgb(255, 255, 255)'
-            table_text_color  = '#2C3E50'
-            input_bg          = '#FFFFFF'
-            input_text        = '#2C3E50'
-            bar_color         = '#1f77b4'
-            table_container_bg= '#FFFFFF'
-            response_bg       = '#FFFFFF'
-            table_bg          = '#FFFFFF'
-
-        # Figures
-        arr_fig = px.bar(
-            arr_data,
-            x='contribution_amount', y='donor_chapter',
-            title='Active Annualized Run Rate by Top 10 Chapters',
-            labels={'contribution_amount': 'Annualized Run Rate (USD)', 'donor_chapter': 'Chapter'},
-            orientation='h',
-            height=600
-        ).update_traces(marker_color=bar_color).update_layout(
-            plot_bgcolor='rgba(0,0,0,0)',
-            paper_bgcolor=chart_paper_color,
-            font_color=chart_text_color,
-            xaxis={'title': 'Annualized Run Rate (USD)', 'gridcolor': 'rgba(255,255,255,0.1)'},
-            yaxis={'tickangle': 0, 'automargin': True, 'gridcolor': 'rgba(255,255,255,0.1)'},
-            margin=dict(l=200, r=50, t=50, b=50)
-        )
-
-        attrition_fig = px.pie(
-            values=[len(merged_df) - len(attrition_pledges), len(attrition_pledges)],
-            names=['Active', 'Attrition'],
-            title='Pledge Attrition Rate',
-            color_discrete_sequence=['#3399FF', '#FF6F61'] if dark_mode else ['#4682B4', '#FF6F61']
-        ).update_layout(
-            plot_bgcolor='rgba(0,0,0,0)',
-            paper_bgcolor=chart_paper_color,
-            font_color=chart_text_color
-        )
-
-        time_lag_fig = px.histogram(
-            merged_df.dropna(subset=['date', 'pledge_created_at']),
-            x=(merged_df['date'] - merged_df['pledge_created_at']).dt.days,
-            nbins=30,
-            title='Time Lag Distribution (Days)',
-            color_discrete_sequence=[bar_color]
-        ).update_layout(
-            plot_bgcolor='rgba(0,0,0,0)',
-            paper_bgcolor=chart_paper_color,
-            font_color=chart_text_color,
-            xaxis={'gridcolor': 'rgba(255,255,255,0.1)'},
-            yaxis={'gridcolor': 'rgba(255,255,255,0.1)'}
-        )
-
-        # Return all 24 outputs
-        return (
-            # 1. main-container.style
-            {'minHeight': '100vh', 'margin': 0, 'padding': 0, 'backgroundColor': background_color},
-            # 2. dashboard-title.style
-            {'textAlign': 'center', 'color': text_color},
-            # 3. money-moved-title.style
-            {'textAlign': 'center', 'color': text_color},
-            # 4. money-moved-value.style
-            {'textAlign': 'center', 'fontSize': 24, 'color': text_color},
-            # 5. active-donors-title.style
-            {'textAlign': 'center', 'color': text_color},
-            # 6. active-donors-value.style
-            {'textAlign': 'center', 'fontSize': 24, 'color': text_color},
-            # 7. attrition-rate-title.style
-            {'textAlign': 'center', 'color': text_color},
-            # 8. attrition-rate-value.style
-            {'textAlign': 'center', 'fontSize': 24, 'color': text_color},
-            # 9. table-title.style
-            {'color': text_color},
-            # 10. arr-chart.figure
-            arr_fig,
-            # 11. attrition-chart.figure
-            attrition_fig,
-            # 12. time-lag-chart.figure
-            time_lag_fig,
-            # 13. merged-data-table.style_header
-            {'backgroundColor': table_header_bg, 'color': table_text_color, 'fontWeight': 'bold'},
-            # 14. merged-data-table.style_data
-            {'backgroundColor': table_data_bg, 'color': table_text_color},
-            # 15. ai-query-input.style
-            {'width': '80%', 'margin': '10px', 'color': input_text, 'backgroundColor': input_bg},
-            # 16. ai-response.style
-            {'margin': '10px', 'whiteSpace': 'pre-wrap', 'color': text_color,
-             'backgroundColor': response_bg, 'minHeight': '100px'},
-            # 17. glossary-table-container.style
-            {'backgroundColor': table_container_bg, 'padding': '0', 'margin': '0', 'color': text_color},
-            # 18. glossary-table.style
-            {'width': '100%', 'border': '1px solid #ddd', 'margin': '20px 0',
-             'border-collapse': 'collapse', 'backgroundColor': table_bg, 'color': text_color},
-            # 19. glossary-title.style
-            {'textAlign': 'center', 'margin': '10px 0', 'color': text_color},
-            # 20. glossary-description.style
-            {'textAlign': 'center', 'margin': '0', 'color': text_color},
-            # 21. ai-title.style
-            {'textAlign': 'center', 'margin': '10px 0', 'color': text_color},
-            # 22. ai-description.style
-            {'textAlign': 'center', 'margin': '0', 'color': text_color},
-            # 23. chapter-filter-label.style
-            {'color': text_color},
-            # 24. status-filter-label.style
-            {'color': text_color}
-        )
+        figs = FIGURES[bool(dark_mode)]
+        return figs['arr'], figs['attrition'], figs['time_lag']
+
+    # Filter operators emitted by the DataTable filter row, mapped to their symbolic aliases
+    # Relational operators of the DataTable filter syntax, longest spelling first so '>=' is not read as '>'
+    filter_operators = [('datestartswith', 'datestartswith'), ('contains', 'contains'),
+                        ('>=', 'ge'), ('<=', 'le'), ('!=', 'ne'), ('<', 'lt'), ('>', 'gt'), ('=', 'eq'),
+                        ('ge', 'ge'), ('le', 'le'), ('ne', 'ne'), ('lt', 'lt'), ('gt', 'gt'), ('eq', 'eq')]
+
+    def match_filter_operator(text):
+        for spelling, operator in filter_operators:
+            if text.startswith(spelling):
+                rest = text[len(spelling):]
+                # Word operators must end at whitespace so e.g. 'gte' or 'negative' don't match
+                if spelling.isalpha() and rest[:1] not in ('', ' '):
+                    continue
+                return operator, rest
+        return None, text
+
+    def split_filter_part(filter_part):
+        # '{column} operator value', where the operator may carry an 'i' (case-insensitive) or 's' prefix
+        filter_part = filter_part.strip()
+        if not filter_part.startswith('{') or '}' not in filter_part:
+            return None, None, None, True
+        name, rest = filter_part[1:].split('}', 1)
+        rest = rest.strip()
+        case_sensitive = True
+        operator, value_part = match_filter_operator(rest)
+        if operator is None and rest[:1] in ('i', 's'):
+            case_sensitive = rest[0] == 's'
+            operator, value_part = match_filter_operator(rest[1:])
+        value_part = value_part.strip()
+        quote = value_part[:1]
+        if quote in ("'", '"', '`') and value_part.endswith(quote) and len(value_part) > 1:
+            value_part = value_part[1:-1].replace('\\' + quote, quote)
+        return name, operator, value_part, case_sensitive
+
+    def filter_query_mask(df, filter_query):
+        # AND every condition into one boolean mask over df's rows
+        keep = np.ones(len(df), dtype=bool)
+        for filter_part in filter_query.split(' && '):
+            column, operator, value, case_sensitive = split_filter_part(filter_part)
+            if column not in df.columns or operator is None:
+                continue
+            series = df[column]
+            if operator == 'contains':
+                mask = series.astype(str).str.contains(value, case=case_sensitive, regex=False)
+            elif operator == 'datestartswith':
+                mask = series.astype(str).str.startswith(value)
+            else:
+                if pd.api.types.is_numeric_dtype(series):
+                    # Numbers compare by value; anything else is compared as text
+                    try:
+                        value = float(value)
+                    except ValueError:
+                        series = series.astype(str)
+                elif not case_sensitive:
+                    series, value = series.astype(str).str.lower(), value.lower()
+                try:
+                    mask = getattr(series, operator)(value)
+                except (TypeError, ValueError):
+                    # e.g. ordering comparisons on categories or dates; fall back to comparing text
+                    mask = getattr(series.astype(str), operator)(str(value))
+            keep &= mask.to_numpy(dtype=bool)
+        return keep
+
+    # Row positions for every chapter, status and (chapter, status) pair, so dropdown filtering is a lookup
+    chapter_positions = merged_df.groupby('donor_chapter', observed=True).indices
+    status_positions = merged_df.groupby('pledge_status', observed=True).indices
+    chapter_status_positions = merged_df.groupby(['donor_chapter', 'pledge_status'], observed=True).indices
+    all_positions = np.arange(len(merged_df))
+    no_positions = np.array([], dtype=np.intp)
+
+    def dropdown_positions(chapter_filter, status_filter):
+        if chapter_filter == 'All' and status_filter == 'All':
+            return all_positions
+        if status_filter == 'All':
+            return chapter_positions.get(chapter_filter, no_positions)
+        if chapter_filter == 'All':
+            return status_positions.get(status_filter, no_positions)
+        return chapter_status_positions.get((chapter_filter, status_filter), no_positions)
+
+    # Dropdown-filtered frames are cached per (chapter, status); callers must not mutate them
+    @functools.lru_cache(maxsize=64)
+    def filter_by_dropdowns(chapter_filter, status_filter):
+        if chapter_filter == 'All' and status_filter == 'All':
+            return merged_df
+        return merged_df.iloc[dropdown_positions(chapter_filter, status_filter)]
+
+    # First page and page count of every observed dropdown combination, serialized once at startup.
+    # A dropdown change resets the table to page 0, so that case becomes a dict lookup.
+    def serialize_first_page(positions):
+        return (merged_df.iloc[positions[:table_page_size]].to_dict('records'),
+                max(1, math.ceil(len(positions) / table_page_size)))
+
+    first_pages = {('All', 'All'): serialize_first_page(all_positions)}
+    for chapter, positions in chapter_positions.items():
+        first_pages[(chapter, 'All')] = serialize_first_page(positions)
+    for status, positions in status_positions.items():
+        first_pages[('All', status)] = serialize_first_page(positions)
+    for chapter_status, positions in chapter_status_positions.items():
+        first_pages[chapter_status] = serialize_first_page(positions)
+
+    # Fully derived table views (dropdowns, filter row, sort) are cached as row positions into merged_df,
+    # so paging through one is just a slice and no cached view holds a copy of the data
+    @functools.lru_cache(maxsize=16)
+    def derive_table_positions(chapter_filter, status_filter, filter_query, sort_key):
+        positions = dropdown_positions(chapter_filter, status_filter)
+        if filter_query:
+            positions = positions[filter_query_mask(filter_by_dropdowns(chapter_filter, status_filter), filter_query)]
+        if sort_key:
+            sort_columns = [column for column, _ in sort_key]
+            # Sort only the sort columns of the selected rows, then reorder the positions to match
+            order = merged_df[sort_columns].iloc[positions].reset_index(drop=True).sort_values(
+                sort_columns,
+                ascending=[direction == 'asc' for _, direction in sort_key]
+            ).index.to_numpy()
+            positions = positions[order]
+        return positions
+
+    # Changing a filter or the sort jumps back to the first page, handled in the browser; Dash waits for it
+    # before running update_table, so the change costs a single server round trip
+    app.clientside_callback(
+        "function(chapter, status, filterQuery, sortBy) { return 0; }",
+        Output('merged-data-table', 'page_current'),
+        Input('chapter-filter', 'value'),
+        Input('status-filter', 'value'),
+        Input('merged-data-table', 'filter_query'),
+        Input('merged-data-table', 'sort_by'),
+        prevent_initial_call=True
+    )
 
-    # Table filtering callback
+    # Table paging/filtering callback
     @app.callback(
         Output('merged-data-table', 'data'),
+        Output('merged-data-table', 'page_count'),
+        Input('merged-data-table', 'page_current'),
+        Input('merged-data-table', 'page_size'),
+        Input('merged-data-table', 'sort_by'),
+        Input('merged-data-table', 'filter_query'),
         Input('chapter-filter', 'value'),
-        Input('status-filter', 'value')
+        Input('status-filter', 'value'),
+        prevent_initial_call=True
     )
-    def update_table(chapter_filter, status_filter):
-        df = merged_df.copy()
-        if chapter_filter != 'All':
-            df = df[df['donor_chapter'] == chapter_filter]
-        if status_filter != 'All':
-            df = df[df['pledge_status'] == status_filter]
-        return df.to_dict('records')
+    def update_table(page_current, page_size, sort_by, filter_query, chapter_filter, status_filter):
+        if not page_current and page_size == table_page_size and not filter_query and not sort_by:
+            first_page = first_pages.get((chapter_filter, status_filter))
+            if first_page is not None:
+                return first_page
+        sort_key = tuple((col['column_id'], col['direction']) for col in sort_by or [])
+        positions = derive_table_positions(chapter_filter, status_filter, filter_query or '', sort_key)
+        start = (page_current or 0) * page_size
+        page_count = max(1, math.ceil(len(positions) / page_size))
+        return merged_df.iloc[positions[start:start + page_size]].to_dict('records'), page_count
+
+    # Gzipped CSV downloads (already base64-encoded for dcc.Download) are cached per (chapter, status);
+    # the data never changes while the app runs
+    @functools.lru_cache(maxsize=64)
+    def build_csv_download(chapter_filter, status_filter):
+        # Write straight into a bytes buffer instead of building a str and encoding a second copy
+        buffer = io.BytesIO()
+        filter_by_dropdowns(chapter_filter, status_filter).to_csv(buffer, index=False, encoding='utf-8')
+        # Repeated column values compress very well; level 1 is nearly as small and several times faster
+        compressed = gzip.compress(buffer.getvalue(), compresslevel=1)
+        return dcc.send_bytes(compressed, filename="merged_data.csv.gz", type="application/gzip")
+
+    # Build the default (All/All) export in the background; it is the largest and most common download.
+    # Startup doesn't wait for it, and if it fails the first export simply builds it on demand.
+    def prebuild_default_csv_download():
+        try:
+            build_csv_download('All', 'All')
+        except Exception:
+            logger.warning(f"Could not pre-build the default CSV export: {traceback.format_exc()}")
+
+    # When run as a script, the debug reloader's watcher process never serves requests, so it skips this
+    if __name__ != '__main__' or os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        threading.Thread(target=prebuild_default_csv_download, daemon=True).start()
 
     # Export CSV callback
     @app.callback(
@@ -516,25 +782,24 @@ try:
     )
     def export_table(n_clicks, chapter_filter, status_filter):
         try:
-            df = merged_df.copy()
-            if chapter_filter != 'All':
-                df = df[df['donor_chapter'] == chapter_filter]
-            if status_filter != 'All':
-                df = df[df['pledge_status'] == status_filter]
-            csv_string = df.to_csv(index=False)
-            return dcc.send_bytes(csv_string.encode(), filename="merged_data.csv")
+            return build_csv_download(chapter_filter, status_filter)
         except Exception:
             return None
 
-    # AI response callback
+    # AI response callback (runs in the background, streaming the partial answer into the response box)
     @app.callback(
         Output('ai-response', 'children'),
         Input('ai-submit-button', 'n_clicks'),
-        State('ai-query-input', 'value')
+        State('ai-query-input', 'value'),
+        background=True,
+        progress=Output('ai-response', 'children'),
+        # Block resubmits while a question is in flight; each would queue another paid API call
+        running=[(Output('ai-submit-button', 'disabled'), True, False)],
+        prevent_initial_call=True
     )
-    def update_ai_response(n_clicks, query):
+    def update_ai_response(set_progress, n_clicks, query):
         if n_clicks > 0 and query:
-            return get_ai_response(query)
+            return get_ai_response(query, on_update=set_progress)
         return "Please enter a question and click Submit"
 
 except Exception as e: